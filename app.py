@@ -1,231 +1,338 @@
 import streamlit as st
-from typing import Optional, TypedDict
+from typing import Callable, Iterator, List, Optional, TypedDict
 import os
+import json
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import time
+import httpx
+import numpy as np
+import pandas as pd
+import faiss
+from sentence_transformers import SentenceTransformer
+import groq
 from groq import Groq
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 from langgraph.graph import StateGraph, END
+from langchain_core.runnables import RunnableConfig
 
 class ProspectMessageState(TypedDict):
     prospect_name: Optional[str]
-    designation: Optional[str]
-    company: Optional[str]
-    industry: Optional[str]
     prospect_background: str
     my_background: Optional[str]
+    event_name: Optional[str]
     final_message: Optional[str]
 
 GROQ_API_KEY = st.secrets["GROQ_API_KEY"]    
 
-client = Groq(api_key=GROQ_API_KEY)
-
-
-def groq_llm(prompt: str, model: str = "llama3-8b-8192", temperature: float = 0.3) -> str:
+@st.cache_resource(show_spinner=False)
+def get_groq_client() -> Groq:
+    """Create one Groq client with a keep-alive connection pool, shared across reruns"""
+    timeout = httpx.Timeout(10.0, connect=2.0)
+    http_client = httpx.Client(
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60),
+        timeout=timeout,
+    )
+    # Retries are handled by _create_completion, so the SDK's own retry loop is disabled
+    return Groq(api_key=GROQ_API_KEY, http_client=http_client, timeout=timeout, max_retries=0)
+
+_backoff = wait_exponential(multiplier=0.25, max=2.0)
+
+# Longer waits (e.g. a per-minute Retry-After) would stall the UI and tie up batch workers
+MAX_RETRY_WAIT = 5.0
+
+def _wait_for_retry(retry_state) -> float:
+    """Honor a rate limit's Retry-After header up to MAX_RETRY_WAIT, otherwise back off exponentially"""
+    error = retry_state.outcome.exception()
+    if isinstance(error, groq.RateLimitError):
+        try:
+            return min(float(error.response.headers.get("retry-after")), MAX_RETRY_WAIT)
+        except (TypeError, ValueError):
+            pass
+    return _backoff(retry_state)
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=_wait_for_retry,
+    retry=retry_if_exception_type((groq.APITimeoutError, groq.APIConnectionError, groq.RateLimitError)),
+    reraise=True,
+)
+def _create_completion(**kwargs):
+    """Create a Groq chat completion, retrying transient failures"""
+    return get_groq_client().chat.completions.create(**kwargs)
+
+
+def groq_llm(messages: List[dict], model: str = "llama-3.1-8b-instant", temperature: float = 0.0, max_tokens: Optional[int] = 200) -> str:
     """Generate text using Groq API"""
-    response = client.chat.completions.create(
+    response = _create_completion(
         model=model,
-        messages=[{"role": "user", "content": prompt}],
+        messages=messages,
         temperature=temperature,
+        max_tokens=max_tokens,
     )
     return response.choices[0].message.content.strip()
 
-def summarizer(text: str) -> str:
-    """Summarize long backgrounds into key points"""
-    if not text or not isinstance(text, str):
-        return "No content to summarize."
-
-    truncated_text = text[:4000]
-    prompt = f"""
-Create 3 concise bullet points from this background text. Focus on key professional highlights and achievements:
-
-{truncated_text}
-
-Bullet points:
--"""
-    try:
-        return groq_llm(prompt).strip()
-    except Exception as e:
-        print(f"Summarization error: {e}")
-        return "Background summary unavailable"
+def groq_llm_stream(messages: List[dict], model: str = "llama-3.1-8b-instant", temperature: float = 0.0, max_tokens: Optional[int] = 200) -> Iterator[str]:
+    """Generate text using Groq API, yielding content deltas as they arrive"""
+    stream = _create_completion(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True,
+    )
+    for chunk in stream:
+        token = chunk.choices[0].delta.content
+        if token:
+            yield token
 
+import re
 
+_NAME_RE = re.compile(r'\b[A-Z][a-z]+(?:\s[A-Z][a-z]+)?')
+_COMPANY_RE = re.compile(r'at\s+\w+\s+(\w+\s+){0,3}(of|Systems|America|Inc\.?|Ltd\.?|Corp\.?)?', re.IGNORECASE)
+_ROLE_RE = re.compile(r'\s*specializing in\s*\w+|\s*with\s+\w+\s+experience|\s*as\s+a\s+\w+')
+_SPACES_RE = re.compile(r'\s{2,}')
+
+_UNWANTED = tuple(s.lower() for s in (
+    "Here is a LinkedIn connection message",
+    "Here’s a LinkedIn message",
+    "LinkedIn connection message:",
+    "Message:",
+    "Output:",
+))
+
+MY_NAME = "Sumana"
+
+# Built once at import so every request sends a byte-identical instruction prefix
+_STATIC_HEADER = f"""Write a SHORT LinkedIn connection message (MAX 3 LINES, 250 chars). Output ONLY the message, with no labels or introductions.
+Follow this pattern:
+1. "Hi <first name>,"
+2. "I see that you'll be attending <event>."
+3. One specific achievement/expertise from their background, WITHOUT mentioning companies or job titles.
+4. Say you'll be there too and would like to connect.
+5. Close with "Best, {MY_NAME}".
+Avoid: exploring, interested, learning, impressive, noteworthy, remarkable, fascinating, admiring, inspiring, no small feat, no easy feat, no easy task, stood out.
+
+Example:
+Hi Tamara,
+I see that you'll be attending Step San Francisco 2025. Your leadership in driving agentic AI and multi-agent systems caught my attention.
+I'll be there too & looking forward to catching up at the event!
+Best,
+{MY_NAME}"""
 
-def summarize_backgrounds(state: ProspectMessageState) -> ProspectMessageState:
-    """Node to summarize prospect and user backgrounds"""
-    return {
-        **state,
-        "prospect_background": summarizer(state["prospect_background"]),
-        # "my_background": summarizer(state["my_background"])
-    }
+BACKGROUND_PLACEHOLDER = "Prospect professional background goes here..."
 
-import re
+_CONN = ("look forward", "would be great", "hope to connect", "love to connect", "looking forward")
 
 def extract_name_from_background(background: str) -> str:
     if not background:
         return "there"
-    match = re.findall(r'\b[A-Z][a-z]+(?:\s[A-Z][a-z]+)?', background)
+    # The name is almost always the first two capitalized words, so only the head is inspected
+    head = background.lstrip()[:64]
+    toks = [tok.rstrip(",.;:|") for tok in head.split()[:2]]
+    if len(toks) >= 2 and _NAME_RE.fullmatch(toks[0]) and _NAME_RE.fullmatch(toks[1]):
+        return f"{toks[0]} {toks[1]}"
+    match = _NAME_RE.search(head)
     if match:
-        return match[0]
+        return match.group(0)
     return "there"
-def generate_message(state: ProspectMessageState) -> ProspectMessageState:
-    """Node to generate LinkedIn message with event context"""
+def generate_message(state: ProspectMessageState, config: RunnableConfig) -> dict:
+    """Node to generate LinkedIn message with event context; returns only the updated field"""
     extracted_name = extract_name_from_background(state['prospect_background'])
     prospect_first_name = extracted_name.split()[0] if extracted_name != "Unknown Prospect" else "there"
-    my_name = "Sumana"  
+    my_name = MY_NAME
 
     # Clean background: Remove company and designation references
-    clean_background = re.sub(
-        r'at\s+\w+\s+(\w+\s+){0,3}(of|Systems|America|Inc\.?|Ltd\.?|Corp\.?)?',
-        '',
-        state['prospect_background'],
-        flags=re.IGNORECASE
-    )
-    clean_background = re.sub(
-        r'\s*specializing in\s*\w+|\s*with\s+\w+\s+experience|\s*as\s+a\s+\w+',
-        '',
-        clean_background
-    ).strip()
-    clean_background = re.sub(r'\s{2,}', ' ', clean_background)  # Remove extra spaces
-
-    prompt = f"""
-IMPORTANT: Output ONLY the message itself. 
-Do NOT include any explanations, labels, or introductions.
-Create a SHORT LinkedIn connection message (MAX 3 LINES , 250 chars) following this natural pattern:
-
-1. "Hi {prospect_first_name},"
-2. Mention event participation: "I see that you will be attending {state.get('event_name', '')}"
-3. Highlight one specific achievement/expertise from their background WITHOUT mentioning companies or job titles
-4. Avoid these flattery words: exploring, interested, learning, No easy feat, Impressive, Noteworthy, Remarkable, Fascinating, Admiring, Inspiring, No small feat, No easy task, Stood out
-5. Express your attendance and desire to connect
-6. Close with "Best, {my_name}"
-
-Examples:
-
-Hi Tamara,
-I see that you'll be attending Step San Francisco  2025. Your leadership in driving agentic AI and multi-agent systems caught my attention. 
-I'll be there too & looking forward to catching up at the event!
-Best,
-{my_name}
-
-Hi David,
-I see that you'll be attending Step San Francisco  2025. Your work on analytics around content protection caught my attention.
-I'll be there too & looking forward to catching up at the event.
-Best,
-{my_name}
-
-Hi Arthy,
-I see you’ll be attending Step San Francisco  2025. Your leadership in driving business transformation, especially in AI adoption and literacy, really caught my attention. I’ll be there too and would love to connect at the event!
-Best,
-{my_name}
-
-Hi Harveer,
-I see that you’ll be attending  Step San Francisco  2025. Your leadership in scaling enterprise AI and driving data-led digital transformation in banking and telecom really caught my attention. I’ll be there too & looking forward to catching up with you at the event.
-Best,
-{my_name}
-
-Hi Prem,
-I see that you’ll be attending Step San Francisco  2025. Your leadership in data governance and complex data migrations, especially in the banking and finance sectors, is quite interesting.
-I’ll be there too & looking forward to catching up with you at the event.
-Best,
-{my_name}
-
-Hi Evan,
-I see that you’ll be attending Step San Francisco  2025. Your role in leading generative AI products and bridging commercial-medical needs with AZBrain is a great example of product-led data science.
-I’ll be there too & looking forward to catching up at the event.
-Best,
-{my_name}
-
-Hi David,
-I see that you’ll be attending Step San Francisco  2025.. Your work leading analytics around content protection and distribution at NBCU, with deep econometric and ML rigor, caught my attention.
-I’ll be there too & looking forward to catching up with you at the event.
-Best,
-{my_name}
-
-Hi Amrita,
-I see that you’ll be attending Step San Francisco  2025. Your work on AI-powered payment analytics and client enablement at BNY, especially your focus on insights and commercialization, stood out to me.
-I’ll be there too & looking forward to catching up with you at the event.
-Best,
-{my_name}
-
-Hi Sandra,
-I see that you’ll be attending Step San Francisco  2025. Your leadership in scaling digital health platforms and AI strategy across clinical-grade solutions and connected care really stood out.
-I’ll be there too & looking forward to catching up with you at the event.
-Best,
-{my_name}
-
-Hi Sharna,
-I see that you’ll be attending Step San Francisco  2025.. Your work scaling GenAI solutions and leading AI CoEs with a strong focus on Responsible AI aligns closely with where enterprise AI is headed.
-I’ll be there too & looking forward to catching up with you at the event.
-Best,
-{my_name}
-
-Hi Ali,
-I see that you’ll be attending Step San Francisco  2025.. Your transition into leading AI partnerships and building transformation programs grounded in culture and impact-driven adoption is genuinely exciting.
-I’ll be there too & looking forward to catching up with you at the event.
-Best,
-{my_name}
+    clean_background = _COMPANY_RE.sub('', state['prospect_background'][:4000])
+    clean_background = _ROLE_RE.sub('', clean_background).strip()
+    clean_background = _SPACES_RE.sub(' ', clean_background)  # Remove extra spaces
+
+    # With no background there is no highlight to write about, so skip the LLM round-trip
+    if not clean_background or clean_background == BACKGROUND_PLACEHOLDER:
+        # The background has no name to extract, so greet by the entered prospect name
+        name_parts = (state.get('prospect_name') or '').split()
+        greeting_name = name_parts[0] if name_parts else "there"
+        message = (
+            f"Hi {greeting_name},\nI see that you'll be attending {state.get('event_name', '')}.\n"
+            f"I'll be there too & looking forward to catching up with you at the event.\nBest,\n{my_name}"
+        )
+        return {"final_message": message}
+
+    my_background = (state.get('my_background') or '')[:4000]
+
+    tail = f"""Prospect: {state['prospect_name']}
+Prospect Background: {clean_background}
+My Background: {my_background or 'Not provided'}
+Event: {state.get('event_name', '')}
 
+Start with "Hi {prospect_first_name},"."""
+    # The stable system turn comes first so identical prefixes line up across requests
+    messages = [
+        {"role": "system", "content": _STATIC_HEADER},
+        {"role": "user", "content": tail},
+    ]
 
-Hi Ramya,
-I see that you’ll be attending Step San Francisco  2025. Your leadership in AI automation for valuation and advisory especially your focus on building from scratch and challenging norms signals bold thinking.
-I’ll be there too & looking forward to catching up with you at the event.
-Best,
-{my_name}
 
-Hi Kate,
-I see that you’ll be attending Step San Francisco  2025. Your shift from claims to IT leadership, along with your deep background in change and project management, reflects a unique blend of ops and tech insight.
-I’ll be there too & looking forward to catching up with you at the event.
-Best,
-{my_name}
-
-Now create for:
-Prospect: {state['prospect_name']}
-Key Highlight: {clean_background}
-Event: {state.get('event_name', '')}
-
-Message (MAX 2-3 LINES within 250 chars):
-Hi {prospect_first_name},"""
+    # The message is capped at 250 chars (~70 tokens), so 120 leaves headroom without padding
+    max_tokens = 120
 
+    # When the caller supplies an on_token callback the completion is streamed to it,
+    # re-rendering every few tokens; cleanup below only runs on the full text
+    on_token = config.get("configurable", {}).get("on_token")
 
     try:
-        response = groq_llm(prompt, temperature=0.7)
+        if on_token is None:
+            response = groq_llm(messages, temperature=0.7, max_tokens=max_tokens)
+        else:
+            tokens = []
+            for i, token in enumerate(groq_llm_stream(messages, temperature=0.7, max_tokens=max_tokens), 1):
+                tokens.append(token)
+                if i % 5 == 0:
+                    on_token("".join(tokens))
+            response = "".join(tokens)
+            on_token(response)
         message = response.strip()
-        unwanted_starts = [
-            "Here is a LinkedIn connection message",
-            "Here’s a LinkedIn message",
-            "LinkedIn connection message:",
-            "Message:",
-            "Output:"
-        ]
-        for phrase in unwanted_starts:
-            if message.lower().startswith(phrase.lower()):
+        msg_lower = message.lower()
+        for phrase in _UNWANTED:
+            if msg_lower.startswith(phrase):
                 message = message.split("\n", 1)[-1].strip()
-
-        connection_phrases = ["look forward", "would be great", "hope to connect", "love to connect", "looking forward"]
-        if not any(phrase in message.lower() for phrase in connection_phrases):
+                msg_lower = message.lower()
+
+        # Decide every fix-up from one lowercased copy, then rewrite the message once
+        closing = f"Best, {my_name}"
+        closing_lower = closing.lower()
+        needs_connection = not any(phrase in msg_lower for phrase in _CONN)
+        # Only add the event sentence when the model left the event out
+        needs_event_line = (state.get('event_name') or '').lower() not in msg_lower
+        if msg_lower.count(closing_lower) > 1:
+            message = message[:msg_lower.find(closing_lower)].strip() + f"\n\n{closing}"
+        elif needs_connection:
             message += "\nI'll be there too & looking forward to catching up with you at the event."
-        if state['company'].lower() not in message.lower():
+        if needs_event_line:
             message = message.replace(
                 f"Hi {prospect_first_name},",
                 f"Hi {prospect_first_name},\nI see that you will be attending  {state.get('event_name', '')}.",
                 1
             )
 
-            
-        if message.count(f"Best, {my_name}") > 1:
-            parts = message.split(f"Best, {my_name}")
-            message = parts[0].strip() + f"\n\nBest, {my_name}"
-
-        return {**state, "final_message": message}
+        return {"final_message": message}
     except Exception as e:
         print(f"Message generation failed: {e}")
-        return {**state, "final_message": "Failed to generate message"}
-
-workflow = StateGraph(ProspectMessageState)
-workflow.add_node("summarize_backgrounds", summarize_backgrounds)
-workflow.add_node("generate_message", generate_message)
-workflow.set_entry_point("summarize_backgrounds")
-workflow.add_edge("summarize_backgrounds", "generate_message")
-workflow.add_edge("generate_message", END)
-graph1 = workflow.compile()
+        return {"final_message": "Failed to generate message"}
+
+@st.cache_resource(show_spinner=False)
+def get_graph():
+    """Compile the message workflow once per Streamlit server"""
+    workflow = StateGraph(ProspectMessageState)
+    workflow.add_node("generate_message", generate_message)
+    workflow.set_entry_point("generate_message")
+    workflow.add_edge("generate_message", END)
+    return workflow.compile()
+
+graph1 = get_graph()
+
+BATCH_CONCURRENCY = 20
+
+async def generate_batch(states: List[ProspectMessageState], on_result: Callable[[int, str], None]) -> List[str]:
+    """Run the graph for many prospects concurrently, reporting each message as it completes"""
+    loop = asyncio.get_running_loop()
+    # generate_message is a sync node making blocking Groq calls. A dedicated pool sized to
+    # BATCH_CONCURRENCY runs that many at once; the loop's default executor may be smaller
+    with ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY) as pool:
+
+        async def run(i: int, state: ProspectMessageState) -> str:
+            result = await loop.run_in_executor(pool, graph1.invoke, state)
+            on_result(i, result["final_message"])
+            return result["final_message"]
+
+        return await asyncio.gather(*(run(i, state) for i, state in enumerate(states)))
+
+SEMANTIC_CACHE_DIR = ".semantic_cache"
+SEMANTIC_CACHE_THRESHOLD = 0.95
+SEMANTIC_CACHE_TTL = 86400
+# Bounds the index and the full rewrite of both files that every store performs
+SEMANTIC_CACHE_MAX_ENTRIES = 2000
+
+@st.cache_resource(show_spinner=False)
+def get_embedder() -> SentenceTransformer:
+    """Load the sentence embedding model once per Streamlit server"""
+    return SentenceTransformer("all-MiniLM-L6-v2")
+
+@st.cache_resource(show_spinner=False)
+def get_semantic_cache() -> dict:
+    """Load the FAISS index and its (key, message) entries from disk, or start empty"""
+    index_path = os.path.join(SEMANTIC_CACHE_DIR, "index.faiss")
+    entries_path = os.path.join(SEMANTIC_CACHE_DIR, "entries.json")
+    if os.path.exists(index_path) and os.path.exists(entries_path):
+        index = faiss.read_index(index_path)
+        with open(entries_path, encoding="utf-8") as f:
+            entries = json.load(f)
+        # A crash between the two writes in store_cached_message leaves extra trailing
+        # entries; drop them so index row N keeps pointing at entry N
+        entries = entries[:index.ntotal]
+    else:
+        index = faiss.IndexFlatIP(get_embedder().get_sentence_embedding_dimension())
+        entries = []
+    return {"index": index, "entries": entries, "lock": threading.Lock()}
+
+def embed_cache_query(company: str, event_name: str, prospect_background: str) -> np.ndarray:
+    """Embed a prospect as an L2-normalized vector for inner-product search"""
+    text = f"{company}|{event_name}|{prospect_background[:512]}"
+    return get_embedder().encode([text], normalize_embeddings=True).astype("float32")
+
+def _find_cached_entry(cache: dict, query: np.ndarray, key: dict) -> Optional[int]:
+    """Return the index row of a near-identical prospect with the same exact key; caller holds the lock"""
+    if cache["index"].ntotal == 0:
+        return None
+    scores, ids = cache["index"].search(query, 1)
+    score, idx = float(scores[0][0]), int(ids[0][0])
+    if idx < 0 or score <= SEMANTIC_CACHE_THRESHOLD:
+        return None
+    # Similar backgrounds are not enough: the message greets the prospect by name
+    entry_key = cache["entries"][idx][0]
+    if all(entry_key.get(field) == value for field, value in key.items()):
+        return idx
+    return None
+
+def lookup_cached_message(query: np.ndarray, prospect_name: str, company: str, event_name: str) -> Optional[str]:
+    """Return a previously generated, unexpired message for a near-identical prospect, if any"""
+    key = {"prospect_name": prospect_name, "company": company, "event_name": event_name}
+    cache = get_semantic_cache()
+    with cache["lock"]:
+        idx = _find_cached_entry(cache, query, key)
+        if idx is None:
+            return None
+        entry = cache["entries"][idx]
+    # Entries written before TTLs were recorded have no timestamp and count as expired
+    if len(entry) < 3 or time.time() - entry[2] > SEMANTIC_CACHE_TTL:
+        return None
+    return entry[1]
+
+def store_cached_message(query: np.ndarray, prospect_name: str, company: str, event_name: str, message: str) -> None:
+    """Add or overwrite a generated message in the semantic cache and persist it to disk"""
+    key = {"prospect_name": prospect_name, "company": company, "event_name": event_name}
+    cache = get_semantic_cache()
+    with cache["lock"]:
+        entry = [key, message, time.time()]
+        idx = _find_cached_entry(cache, query, key)
+        if idx is None and cache["index"].ntotal >= SEMANTIC_CACHE_MAX_ENTRIES:
+            return
+        if idx is None:
+            cache["index"].add(query)
+            cache["entries"].append(entry)
+        else:
+            cache["entries"][idx] = entry
+        os.makedirs(SEMANTIC_CACHE_DIR, exist_ok=True)
+        # Each file is swapped in atomically. Entries go first, so a crash between the
+        # writes only leaves surplus entries, which get_semantic_cache trims on load
+        entries_path = os.path.join(SEMANTIC_CACHE_DIR, "entries.json")
+        with open(entries_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(cache["entries"], f)
+        os.replace(entries_path + ".tmp", entries_path)
+        index_path = os.path.join(SEMANTIC_CACHE_DIR, "index.faiss")
+        faiss.write_index(cache["index"], index_path + ".tmp")
+        os.replace(index_path + ".tmp", index_path)
 
 
 st.set_page_config(page_title="LinkedIn Message Generator", layout="centered")
@@ -233,13 +340,11 @@ st.title(" First Level Msgs for Step San Francisco  2025")
 
 with st.form("prospect_form"):
     prospect_name = st.text_input("Prospect Name", "")
-    designation = ""
     company = ""
-    industry = ""
-    prospect_background = st.text_area("Prospect Background", "Prospect professional background goes here...")
+    prospect_background = st.text_area("Prospect Background", BACKGROUND_PLACEHOLDER)
     my_background = ""
     event_name =  "Step San Francisco 2025"
-    event_details = "August 12-14, MGM Grand Las Vegas"
+    regenerate = st.checkbox("Regenerate (ignore the cached message for this prospect)")
 
     submitted = st.form_submit_button("Generate Message")
 
@@ -247,15 +352,33 @@ if submitted:
     with st.spinner("Generating message..."):
         initial_state: ProspectMessageState = {
             "prospect_name": prospect_name,
-            "designation": designation,
-            "company": company,
-            "industry": industry,
             "prospect_background": prospect_background,
             "my_background": my_background,
             "event_name": event_name,
-            "event_details": event_details,
         }
-        result = graph1.invoke(initial_state)
+        # The semantic cache is only an optimisation; if the embedder or index fails, generate directly
+        cache_query = None
+        cached_message = None
+        try:
+            cache_query = embed_cache_query(company, event_name, prospect_background)
+            if not regenerate:
+                cached_message = lookup_cached_message(cache_query, prospect_name, company, event_name)
+        except Exception as e:
+            print(f"Semantic cache lookup failed: {e}")
+        if cached_message is not None:
+            result = {**initial_state, "final_message": cached_message}
+        else:
+            stream_placeholder = st.empty()
+            result = graph1.invoke(
+                initial_state,
+                config={"configurable": {"on_token": stream_placeholder.markdown}},
+            )
+            stream_placeholder.empty()
+            if cache_query is not None and result["final_message"] != "Failed to generate message":
+                try:
+                    store_cached_message(cache_query, prospect_name, company, event_name, result["final_message"])
+                except Exception as e:
+                    print(f"Semantic cache store failed: {e}")
 
     st.success(" Message Generated!")
     st.text_area("Final LinkedIn Message", result["final_message"], height=200, key="final_msg")
@@ -274,3 +397,45 @@ if submitted:
 
     st.components.v1.html(copy_code, height=50)
 
+st.divider()
+st.subheader("Batch Messages")
+
+with st.form("batch_form"):
+    prospect_csv = st.file_uploader("Prospect CSV (prospect_name, prospect_background)", type="csv")
+    batch_submitted = st.form_submit_button("Generate Messages")
+
+if batch_submitted and prospect_csv is not None:
+    prospects = pd.read_csv(prospect_csv, dtype=str).fillna("")
+    missing_columns = {"prospect_name", "prospect_background"} - set(prospects.columns)
+    if missing_columns:
+        st.error(f"CSV is missing columns: {', '.join(sorted(missing_columns))}")
+    else:
+        states: List[ProspectMessageState] = [
+            {
+                "prospect_name": row["prospect_name"],
+                "prospect_background": row["prospect_background"],
+                "my_background": my_background,
+                "event_name": event_name,
+            }
+            for _, row in prospects.iterrows()
+        ]
+        prospects["final_message"] = ""
+        results_table = st.empty()
+
+        def show_result(i: int, message: str) -> None:
+            prospects.at[prospects.index[i], "final_message"] = message
+            results_table.dataframe(prospects, use_container_width=True)
+
+        with st.spinner(f"Generating {len(states)} messages..."):
+            asyncio.run(generate_batch(states, show_result))
+        results_table.empty()
+        st.session_state["batch_results"] = prospects
+
+if "batch_results" in st.session_state:
+    edited_results = st.data_editor(st.session_state["batch_results"], use_container_width=True, key="batch_editor")
+    st.download_button(
+        "Download CSV",
+        edited_results.to_csv(index=False),
+        file_name="linkedin_messages.csv",
+        mime="text/csv",
+    )